@@ -1,6 +1,7 @@
 import argparse
 import logging
 import os
+import time
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(name)s - %(levelname)s - %(message)s")
 
@@ -15,6 +16,7 @@ try:
     from utils.db_handler import DatabaseHandler
     from utils.generate_prompt import generate_prompt
     from utils.load_json import load_content_types, load_personalities
+    from utils.model_router import ModelRouter
     from utils.post import SocialMediaPoster
 except ImportError as e:
     logger.error("Failed to import a required module. Ensure all dependencies are installed.")
@@ -25,26 +27,96 @@ except ImportError as e:
 load_dotenv()
 
 
-def generate_tweet_content(client, model, personality, content_type, include_hashtags, include_emojis):
-    """Generates tweet content using the specified AI model and parameters."""
+def generate_tweet_content(
+    client,
+    model,
+    personality,
+    content_type,
+    include_hashtags,
+    include_emojis,
+    router=None,
+    previous_tweets=None,
+):
+    """
+    Generates tweet content using the specified AI model and parameters.
+
+    If a router is given, the latency, token usage and outcome of the request are recorded
+    for adaptive model routing. When previous tweets are given, a duplicate of one of them
+    is rejected and None is returned.
+    """
     prompt = generate_prompt(
         personality=personality,
         content_type=content_type,
         content_format="Text",  # Hardcoded for tweets
         include_hashtags=include_hashtags,
         include_emojis=include_emojis,
+        previous_tweets=previous_tweets,
     )
 
-    logger.info("Generating tweet content...")
+    logger.info(f"Generating tweet content with {model}...")
+    start = time.perf_counter()
     try:
         response = client.chat.completions.create(
             model=model,
             messages=[{"role": "user", "content": prompt}],
         )
-        return response.choices[0].message.content.strip()
+        tweet_text = response.choices[0].message.content.strip()
     except Exception as e:
         logger.error(f"❌ Error calling language model API: {e}")
+        if router:
+            router.record(model, time.perf_counter() - start, ok=False)
         raise e
+    latency = time.perf_counter() - start
+
+    is_duplicate = previous_tweets is not None and tweet_text.casefold() in {
+        tweet.tweet_text.strip().casefold() for tweet in previous_tweets
+    }
+    if router:
+        usage = response.usage
+        router.record(
+            model,
+            latency,
+            ok=True,
+            prompt_tokens=usage.prompt_tokens if usage else None,
+            completion_tokens=usage.completion_tokens if usage else None,
+            dedup_rejected=is_duplicate,
+        )
+    if is_duplicate:
+        logger.warning(f"Rejected duplicate tweet generated by {model}.")
+        return None
+    return tweet_text
+
+
+def generate_with_routing(router, bulk, personality, content_type, include_hashtags, include_emojis):
+    """
+    Generates tweet content with the first model picked by the router that succeeds.
+
+    Returns:
+        tuple: The model_name used and the generated tweet text.
+    """
+    previous_tweets = DatabaseHandler().get_all_tweets()
+    for model in router.rank(bulk=bulk):
+        try:
+            client = get_api_client(model.api)
+            tweet_text = generate_tweet_content(
+                client,
+                model.model_name,
+                personality,
+                content_type,
+                include_hashtags,
+                include_emojis,
+                router=router,
+                previous_tweets=previous_tweets,
+            )
+        except Exception as e:
+            logger.warning(f"Model {model} failed, trying the next candidate: {e}")
+            continue
+        if tweet_text:
+            logger.info(f"Routed to {model}.")
+            return model.model_name, tweet_text
+
+    logger.error("❌ All candidate models failed to generate content.")
+    raise ValueError("Content generation failed.")
 
 
 def post_and_save_tweet(tweet_content, model_name, personality, content_type):
@@ -93,8 +165,15 @@ def main():
         "--model",
         type=str,
         default=os.environ.get("MODEL", "gemini-2.5-pro"),
-        choices=model_names,
-        help="The model to use for generation.",
+        choices=model_names + ["auto"],
+        help="The model to use for generation. Use 'auto' to pick one from observed latency, cost and failure rate.",
+    )
+    bulk_env = os.environ.get("BULK", "False").lower() == "true"
+    parser.add_argument(
+        "--bulk",
+        action="store_true",
+        default=bulk_env,
+        help="With --model auto, prefer the cheapest model that still meets the quality thresholds.",
     )
     parser.add_argument(
         "--personality",
@@ -133,28 +212,43 @@ def main():
     )
     args = parser.parse_args()
 
-    # Get API configuration for the selected model
-    api_config = MODEL_OPTIONS.get(args.model).api
-    if not api_config:
-        logger.error(f"Error: No API configuration found for model '{args.model}'.")
-        raise ValueError("No API configuration found.")
-
-    # Initialize the API client
-    client = get_api_client(api_config)
-    if not client:
-        logger.error(f"Error: Failed to initialize API client for {api_config.get('name')}.")
-        logger.error("Please ensure the required API key environment variable is set.")
-        raise ValueError("Failed to initialize API client.")
-
-    # Generate Tweet
-    tweet_text = generate_tweet_content(
-        client,
-        args.model,
-        args.personality,
-        args.content_type,
-        args.include_hashtags,
-        args.include_emojis,
-    )
+    router = ModelRouter()
+
+    if args.model == "auto":
+        model_name, tweet_text = generate_with_routing(
+            router,
+            args.bulk,
+            args.personality,
+            args.content_type,
+            args.include_hashtags,
+            args.include_emojis,
+        )
+    else:
+        model_name = args.model
+
+        # Get API configuration for the selected model
+        api_config = MODEL_OPTIONS.get(model_name).api
+        if not api_config:
+            logger.error(f"Error: No API configuration found for model '{model_name}'.")
+            raise ValueError("No API configuration found.")
+
+        # Initialize the API client
+        client = get_api_client(api_config)
+        if not client:
+            logger.error(f"Error: Failed to initialize API client for {api_config.get('name')}.")
+            logger.error("Please ensure the required API key environment variable is set.")
+            raise ValueError("Failed to initialize API client.")
+
+        # Generate Tweet
+        tweet_text = generate_tweet_content(
+            client,
+            model_name,
+            args.personality,
+            args.content_type,
+            args.include_hashtags,
+            args.include_emojis,
+            router=router,
+        )
 
     if not tweet_text:
         logger.error("Stopping process due to content generation failure.")
@@ -168,7 +262,7 @@ def main():
     if args.post:
         post_and_save_tweet(
             tweet_text,
-            args.model,
+            model_name,
             args.personality,
             args.content_type,
         )
@@ -7,11 +7,19 @@ class Model:
     name: str  # User-friendly display name (e.g., "GPT-4o")
     model_name: str  # API identifier (e.g., "gpt-4o")
     api: dict  # Associated API configuration (GEMINI_API or OPENAI_API)
+    input_cost: float  # USD per 1M prompt tokens
+    output_cost: float  # USD per 1M completion tokens
 
-    def __init__(self, name, model_name, api):
+    def __init__(self, name, model_name, api, input_cost=0.0, output_cost=0.0):
         self.name = name
         self.model_name = model_name
         self.api = api
+        self.input_cost = input_cost
+        self.output_cost = output_cost
+
+    def estimate_cost(self, prompt_tokens, completion_tokens):
+        """Estimates the USD cost of a single request with the given token counts."""
+        return (prompt_tokens * self.input_cost + completion_tokens * self.output_cost) / 1_000_000
 
     def __repr__(self):
         return f"Model(name={self.name}, model_name={self.model_name})"
@@ -24,42 +32,56 @@ GEMINI_2_5_PRO = Model(
     name="Gemini 2.5 Pro",
     model_name="gemini-2.5-pro",
     api=GEMINI_API,
+    input_cost=1.25,
+    output_cost=10.00,
 )
 
 GEMINI_2_5_FLASH = Model(
     name="Gemini 2.5 Flash",
     model_name="gemini-2.5-flash",
     api=GEMINI_API,
+    input_cost=0.30,
+    output_cost=2.50,
 )
 
 GEMINI_2_5_FLASH_LITE = Model(
     name="Gemini 2.5 Flash Lite",
     model_name="gemini-2.5-flash-lite",
     api=GEMINI_API,
+    input_cost=0.10,
+    output_cost=0.40,
 )
 
 O3 = Model(
     name="O3",
     model_name="o3-2025-04-16",
     api=OPENAI_API,
+    input_cost=2.00,
+    output_cost=8.00,
 )
 
 O4_MINI = Model(
     name="O4 Mini",
     model_name="o4-mini-2025-04-16",
     api=OPENAI_API,
+    input_cost=1.10,
+    output_cost=4.40,
 )
 
 GPT_4O = Model(
     name="GPT-4o",
     model_name="gpt-4o",
     api=OPENAI_API,
+    input_cost=2.50,
+    output_cost=10.00,
 )
 
 GPT_4O_MINI = Model(
     name="GPT-4o Mini",
     model_name="gpt-4o-mini",
     api=OPENAI_API,
+    input_cost=0.15,
+    output_cost=0.60,
 )
 
 MODEL_OPTIONS = {
@@ -0,0 +1,22 @@
+import pytest
+
+from utils.api_config import getenv_number
+
+
+@pytest.mark.parametrize(
+    "value, expected",
+    [(None, 1.5), ("", 1.5), ("abc", 1.5), ("2.5", 2.5)],
+)
+def test_getenv_number_float(monkeypatch, value, expected):
+    if value is None:
+        monkeypatch.delenv("ROUTER_TEST_VALUE", raising=False)
+    else:
+        monkeypatch.setenv("ROUTER_TEST_VALUE", value)
+
+    assert getenv_number("ROUTER_TEST_VALUE", 1.5) == expected
+
+
+def test_getenv_number_int_rejects_float(monkeypatch):
+    monkeypatch.setenv("ROUTER_TEST_VALUE", "3.5")
+
+    assert getenv_number("ROUTER_TEST_VALUE", 3, cast=int) == 3
@@ -0,0 +1,79 @@
+from types import SimpleNamespace
+
+import pytest
+
+import main
+from models.llm import Model
+from utils.model_router import ModelRouter
+
+PREVIOUS_TWEET = "An old tweet"
+
+
+class FakeClient:
+    """Mimics the chat completions API, returning a fixed text or raising an error."""
+
+    def __init__(self, text=None, error=None):
+        self.error = error
+        self.text = text
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+
+    def create(self, model, messages):
+        if self.error:
+            raise self.error
+        message = SimpleNamespace(content=self.text)
+        usage = SimpleNamespace(prompt_tokens=100, completion_tokens=20)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)], usage=usage)
+
+
+def make_router(tmp_path, clients, monkeypatch):
+    models = {
+        name: Model(name=name, model_name=name, api={"name": "OpenAI", "key": "test-key", "model": name})
+        for name in clients
+    }
+    config = {
+        "stats_path": str(tmp_path / "stats.json"),
+        "latency_slo": 30.0,
+        "cost_budget": 1.0,
+        "max_error_rate": 0.3,
+        "max_dedup_rate": 0.2,
+        "window": 50,
+        "min_samples": 3,
+        "horizon": 604800.0,
+        "cooldown": 86400.0,
+        "explore_rate": 0.0,
+    }
+    previous = [SimpleNamespace(tweet_text=PREVIOUS_TWEET)]
+    monkeypatch.setattr(main, "DatabaseHandler", lambda: SimpleNamespace(get_all_tweets=lambda: previous))
+    monkeypatch.setattr(main, "generate_prompt", lambda **kwargs: "prompt")
+    monkeypatch.setattr(main, "get_api_client", lambda api: clients[api["model"]])
+    router = ModelRouter(models=models, config=config)
+    monkeypatch.setattr(router, "rank", lambda bulk=False: list(models.values()))
+    return router
+
+
+def generate(router):
+    return main.generate_with_routing(router, False, "personality", "content type", True, True)
+
+
+def test_routing_falls_through_on_error_and_duplicate(tmp_path, monkeypatch):
+    clients = {
+        "broken": FakeClient(error=RuntimeError("provider down")),
+        "repeater": FakeClient(text=PREVIOUS_TWEET.upper()),
+        "fresh": FakeClient(text="A brand new tweet"),
+    }
+    router = make_router(tmp_path, clients, monkeypatch)
+
+    assert generate(router) == ("fresh", "A brand new tweet")
+    assert router.stats("broken")["error_rate"] == 1.0
+    assert router.stats("repeater")["dedup_rate"] == 1.0
+
+
+def test_routing_raises_when_every_model_fails(tmp_path, monkeypatch):
+    clients = {
+        "broken": FakeClient(error=RuntimeError("provider down")),
+        "repeater": FakeClient(text=PREVIOUS_TWEET),
+    }
+    router = make_router(tmp_path, clients, monkeypatch)
+
+    with pytest.raises(ValueError):
+        generate(router)
@@ -0,0 +1,175 @@
+import time
+
+import pytest
+
+from models.llm import Model
+from utils.model_router import DEFAULT_COMPLETION_TOKENS, DEFAULT_PROMPT_TOKENS, ModelRouter
+
+API = {"name": "OpenAI", "key": "test-key"}
+
+
+def make_config(tmp_path, **overrides):
+    config = {
+        "stats_path": str(tmp_path / "stats.json"),
+        "latency_slo": 30.0,
+        "cost_budget": 1.0,
+        "max_error_rate": 0.3,
+        "max_dedup_rate": 0.2,
+        "window": 50,
+        "min_samples": 3,
+        "horizon": 604800.0,
+        "cooldown": 86400.0,
+        "explore_rate": 0.0,
+    }
+    config.update(overrides)
+    return config
+
+
+def make_sample(ok=True, latency=2.0, age=0.0, prompt_tokens=100, completion_tokens=50, dedup=False):
+    return {
+        "ts": time.time() - age,
+        "ok": ok,
+        "latency": latency,
+        "prompt_tokens": prompt_tokens,
+        "completion_tokens": completion_tokens,
+        "dedup": dedup,
+    }
+
+
+@pytest.fixture
+def router(tmp_path):
+    models = {
+        "healthy": Model(name="Healthy", model_name="healthy", api=API),
+        "failing": Model(name="Failing", model_name="failing", api=API),
+        "untried": Model(name="Untried", model_name="untried", api=API),
+    }
+    return ModelRouter(models=models, config=make_config(tmp_path))
+
+
+def names(models):
+    return [model.model_name for model in models]
+
+
+def test_all_failure_model_weighs_about_zero(router):
+    router.samples["healthy"] = [make_sample() for _ in range(2)]
+    router.samples["failing"] = [make_sample(ok=False) for _ in range(2)]
+
+    assert router.weight(router.stats("untried")) == 1.0
+    assert router.weight(router.stats("failing")) == pytest.approx(0.0)
+    assert router.weight(router.stats("healthy")) > 0.9
+
+    # Below min_samples the failing model is not shed yet, but it must still rank last.
+    for _ in range(20):
+        assert names(router.rank())[-1] == "failing"
+
+
+def test_samples_outside_horizon_are_ignored(router):
+    router.samples["failing"] = [make_sample(ok=False, age=router.config["horizon"] + 1)]
+
+    assert router.stats("failing")["samples"] == 0
+
+
+def test_successful_probe_after_cooldown_resets_shed_model(router):
+    age = router.config["cooldown"] + 1
+    router.samples["failing"] = [make_sample(ok=i >= 20, age=age) for i in range(50)]
+    assert router.is_unhealthy(router.stats("failing"))
+
+    router.record("failing", 2.0, ok=True)
+
+    summary = router.stats("failing")
+    assert summary["samples"] == 1
+    assert summary["error_rate"] == 0.0
+    assert not router.is_shed(summary)
+
+
+def test_slow_success_does_not_reset_shed_model(router):
+    age = router.config["cooldown"] + 1
+    router.samples["healthy"] = [make_sample(latency=60.0, age=age) for _ in range(3)]
+
+    router.record("healthy", 90.0, ok=True)
+
+    summary = router.stats("healthy")
+    assert summary["samples"] == 4
+    assert router.is_shed(summary)
+    assert "healthy" not in names(router.rank())
+
+
+def test_success_within_cooldown_does_not_reset_shed_model(router):
+    router.samples["failing"] = [make_sample(ok=False) for _ in range(3)]
+
+    router.record("failing", 2.0, ok=True)
+
+    summary = router.stats("failing")
+    assert summary["samples"] == 4
+    assert router.is_shed(summary)
+
+
+def test_shed_model_is_reprobed_after_cooldown(router):
+    router.samples["failing"] = [make_sample(ok=False) for _ in range(3)]
+    assert "failing" not in names(router.rank())
+
+    router.samples["failing"] = [make_sample(ok=False, age=router.config["cooldown"] + 1) for _ in range(3)]
+    assert "failing" in names(router.rank())
+
+
+def test_bulk_orders_cheapest_first_and_drops_duplicate_prone_models(tmp_path):
+    models = {
+        "cheap": Model(name="Cheap", model_name="cheap", api=API, input_cost=0.1, output_cost=0.4),
+        "mid": Model(name="Mid", model_name="mid", api=API, input_cost=1.0, output_cost=4.0),
+        "pricey": Model(name="Pricey", model_name="pricey", api=API, input_cost=2.0, output_cost=8.0),
+    }
+    router = ModelRouter(models=models, config=make_config(tmp_path))
+    router.samples["cheap"] = [make_sample(dedup=True) for _ in range(3)]
+
+    assert names(router.rank(bulk=True)) == ["mid", "pricey"]
+
+
+def test_models_over_cost_budget_are_excluded(tmp_path):
+    models = {
+        "cheap": Model(name="Cheap", model_name="cheap", api=API, input_cost=0.1, output_cost=0.4),
+        "pricey": Model(name="Pricey", model_name="pricey", api=API, input_cost=100.0, output_cost=400.0),
+    }
+    router = ModelRouter(models=models, config=make_config(tmp_path, cost_budget=0.01))
+
+    assert names(router.rank()) == ["cheap"]
+
+
+def test_models_without_api_key_are_excluded(tmp_path):
+    models = {
+        "keyed": Model(name="Keyed", model_name="keyed", api=API),
+        "keyless": Model(name="Keyless", model_name="keyless", api={"name": "OpenAI", "key": None}),
+    }
+    router = ModelRouter(models=models, config=make_config(tmp_path))
+
+    assert names(router.rank()) == ["keyed"]
+
+
+def test_missing_usage_falls_back_to_default_token_estimate(tmp_path):
+    model = Model(name="Metered", model_name="metered", api=API, input_cost=1.0, output_cost=4.0)
+    router = ModelRouter(models={"metered": model}, config=make_config(tmp_path))
+    router.samples["metered"] = [make_sample(prompt_tokens=None, completion_tokens=None)]
+
+    expected = model.estimate_cost(DEFAULT_PROMPT_TOKENS, DEFAULT_COMPLETION_TOKENS)
+    assert router.stats("metered")["cost"] == pytest.approx(expected)
+
+    router.samples["metered"].append(make_sample(prompt_tokens=1000, completion_tokens=100))
+    assert router.stats("metered")["cost"] == pytest.approx(model.estimate_cost(1000, 100))
+
+
+def test_stats_survive_save_and_load(router):
+    router.record("healthy", 2.0, ok=True, prompt_tokens=100, completion_tokens=50)
+    router.record("failing", 1.0, ok=False)
+
+    reloaded = ModelRouter(models=router.models, config=router.config)
+
+    assert reloaded.samples == router.samples
+    assert reloaded.stats("failing")["error_rate"] == 1.0
+
+
+def test_corrupt_stats_file_is_ignored(tmp_path):
+    config = make_config(tmp_path)
+    (tmp_path / "stats.json").write_text("{not json", encoding="utf-8")
+
+    router = ModelRouter(models={}, config=config)
+
+    assert router.samples == {}
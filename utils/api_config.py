@@ -1,9 +1,35 @@
+import logging
 import os
 
 from dotenv import load_dotenv
 
 load_dotenv(override=True)
 
+logger = logging.getLogger(__name__)
+
+
+def getenv_number(name, default, cast=float):
+    """
+    Reads a numeric environment variable, falling back to the default if it is unset or malformed.
+
+    Args:
+        name (str): Name of the environment variable.
+        default (int | float): Value to use if the variable is unset, empty or cannot be parsed.
+        cast (type): Numeric type to parse the value as (float or int).
+
+    Returns:
+        int | float: The parsed value or the default.
+    """
+    value = os.getenv(name)
+    if not value:
+        return default
+    try:
+        return cast(value)
+    except ValueError:
+        logger.warning(f"Ignoring invalid value {value!r} for {name}; using {default}.")
+        return default
+
+
 GEMINI_API = {
     "name": "Gemini",
     "key": os.getenv("GEMINI_API_KEY"),
@@ -34,3 +60,17 @@ SUPABASE_API = {
     "url": os.getenv("SUPABASE_URL"),
     "key": os.getenv("SUPABASE_KEY"),
 }
+
+ROUTER_CONFIG = {
+    "name": "Router",
+    "stats_path": os.getenv("ROUTER_STATS_PATH") or ".model_stats.json",
+    "latency_slo": getenv_number("ROUTER_LATENCY_SLO", 30.0),  # p95 seconds
+    "cost_budget": getenv_number("ROUTER_COST_BUDGET", 0.05),  # USD per tweet
+    "max_error_rate": getenv_number("ROUTER_MAX_ERROR_RATE", 0.3),
+    "max_dedup_rate": getenv_number("ROUTER_MAX_DEDUP_RATE", 0.2),
+    "window": getenv_number("ROUTER_WINDOW", 50, cast=int),
+    "min_samples": getenv_number("ROUTER_MIN_SAMPLES", 3, cast=int),
+    "horizon": getenv_number("ROUTER_HORIZON", 604800.0),  # seconds of history used for the stats
+    "cooldown": getenv_number("ROUTER_COOLDOWN", 86400.0),  # seconds before a shed model is re-probed
+    "explore_rate": getenv_number("ROUTER_EXPLORE_RATE", 0.1),
+}
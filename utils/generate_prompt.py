@@ -1,7 +1,9 @@
 from utils.db_handler import DatabaseHandler
 
 
-def generate_prompt(personality, content_type, content_format, include_hashtags=True, include_emojis=True):
+def generate_prompt(
+    personality, content_type, content_format, include_hashtags=True, include_emojis=True, previous_tweets=None
+):
     """
     Generates a prompt for the LLM to create a tweet, emphasizing variety and clarity.
 
@@ -11,6 +13,7 @@ def generate_prompt(personality, content_type, content_format, include_hashtags=
         content_format (str): The desired style (e.g., informative, humorous).
         include_hashtags (bool): Whether to include hashtags.
         include_emojis (bool): Whether to include emojis.
+        previous_tweets (list, optional): Previously posted tweets. Fetched from the database if None.
 
     Returns:
         str: The generated prompt.
@@ -52,8 +55,9 @@ def generate_prompt(personality, content_type, content_format, include_hashtags=
     )
 
     # Get previous tweets from the database
-    db_handler = DatabaseHandler()
-    previous_tweets = db_handler.get_all_tweets()
+    if previous_tweets is None:
+        db_handler = DatabaseHandler()
+        previous_tweets = db_handler.get_all_tweets()
     previous_tweets_text = "\n".join(f"- {tweet.tweet_text}" for tweet in previous_tweets)
     if not previous_tweets_text:
         previous_tweets_text = "None"
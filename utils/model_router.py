@@ -0,0 +1,240 @@
+import json
+import logging
+import math
+import os
+import random
+import time
+
+from models.llm import MODEL_OPTIONS
+
+from .api_config import ROUTER_CONFIG
+
+logger = logging.getLogger(__name__)
+
+# Token estimates used for a model that has no successful samples with token usage yet.
+DEFAULT_PROMPT_TOKENS = 1500
+DEFAULT_COMPLETION_TOKENS = 300
+
+
+def percentile(values, pct):
+    """
+    Computes a nearest-rank percentile.
+
+    Args:
+        values (list): The values to compute the percentile of.
+        pct (float): The percentile, between 0 and 100.
+
+    Returns:
+        float: The percentile value, or None if there are no values.
+    """
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = max(0, math.ceil(pct / 100 * len(ordered)) - 1)
+    return ordered[index]
+
+
+class ModelRouter:
+    """
+    Picks a model for each request from rolling per-model statistics.
+
+    Every generation attempt is recorded as a sample (latency, success, token usage and
+    whether the output was rejected as a duplicate). The last `window` samples per model
+    are persisted to a local JSON file so the statistics survive between runs; only samples
+    from the last `horizon` seconds count towards the statistics.
+    """
+
+    models: dict
+    config: dict
+    samples: dict
+
+    def __init__(self, models=None, config=None):
+        """Initializes the router and loads persisted statistics."""
+        self.models = models if models is not None else MODEL_OPTIONS
+        self.config = config if config is not None else ROUTER_CONFIG
+        self.samples = self.load()
+
+    def load(self):
+        """
+        Loads persisted samples from the stats file.
+
+        Returns:
+            dict: Mapping of model_name to a list of samples. Empty if the file is missing or invalid.
+        """
+        path = self.config["stats_path"]
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                data = json.load(file)
+            if not isinstance(data, dict):
+                raise ValueError("Stats file must contain a JSON object.")
+            return data
+        except FileNotFoundError:
+            return {}
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable model stats file {path}: {e}")
+            return {}
+
+    def save(self):
+        """Writes the samples to the stats file, replacing it atomically."""
+        path = self.config["stats_path"]
+        tmp_path = f"{path}.tmp"
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as file:
+                json.dump(self.samples, file)
+            os.replace(tmp_path, path)
+        except Exception as e:
+            logger.warning(f"Failed to save model stats to {path}: {e}")
+
+    def record(self, model_name, latency, ok, prompt_tokens=None, completion_tokens=None, dedup_rejected=False):
+        """
+        Records the outcome of a generation attempt and persists it.
+
+        A successful re-probe of an unhealthy model, i.e. a success within the latency SLO
+        once the cooldown has passed, clears its history so one outage does not keep it shed
+        for days.
+
+        Args:
+            model_name (str): The API identifier of the model.
+            latency (float): Wall-clock duration of the request in seconds.
+            ok (bool): Whether the request succeeded.
+            prompt_tokens (int, optional): Prompt tokens reported by the API, if any.
+            completion_tokens (int, optional): Completion tokens reported by the API, if any.
+            dedup_rejected (bool): Whether the output was rejected as a duplicate of a previous tweet.
+        """
+        now = time.time()
+        history = self.samples.setdefault(model_name, [])
+        summary = self.stats(model_name, now=now)
+        if (
+            ok
+            and latency <= self.config["latency_slo"]
+            and self.is_unhealthy(summary)
+            and now - summary["last_ts"] >= self.config["cooldown"]
+        ):
+            logger.info(f"Model {model_name} recovered; resetting its routing stats.")
+            history.clear()
+        history.append(
+            {
+                "ts": now,
+                "ok": ok,
+                "latency": latency,
+                "prompt_tokens": prompt_tokens,
+                "completion_tokens": completion_tokens,
+                "dedup": dedup_rejected,
+            }
+        )
+        del history[: -self.config["window"]]
+        self.save()
+
+    def stats(self, model_name, now=None):
+        """
+        Summarizes the rolling statistics for a model over the last `horizon` seconds.
+
+        Args:
+            model_name (str): The API identifier of the model.
+            now (float, optional): Current timestamp. Defaults to time.time().
+
+        Returns:
+            dict: Sample count, p50/p95 latency, error rate, tokens per tweet, dedup rejection rate,
+                estimated cost per request and the timestamp of the last sample.
+        """
+        now = now if now is not None else time.time()
+        history = [s for s in self.samples.get(model_name, []) if now - s["ts"] <= self.config["horizon"]]
+        successes = [s for s in history if s["ok"]]
+        model = self.models.get(model_name)
+
+        # Samples from providers that returned no usage carry None and are left out of the averages.
+        metered = [s for s in successes if s["prompt_tokens"] is not None and s["completion_tokens"] is not None]
+        if metered:
+            prompt_tokens = sum(s["prompt_tokens"] for s in metered) / len(metered)
+            completion_tokens = sum(s["completion_tokens"] for s in metered) / len(metered)
+        else:
+            prompt_tokens, completion_tokens = DEFAULT_PROMPT_TOKENS, DEFAULT_COMPLETION_TOKENS
+
+        latencies = [s["latency"] for s in successes]
+        return {
+            "samples": len(history),
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "error_rate": (len(history) - len(successes)) / len(history) if history else 0.0,
+            "tokens_per_tweet": completion_tokens,
+            "dedup_rate": sum(1 for s in successes if s["dedup"]) / len(successes) if successes else 0.0,
+            "cost": model.estimate_cost(prompt_tokens, completion_tokens) if model else 0.0,
+            "last_ts": history[-1]["ts"] if history else None,
+        }
+
+    def is_shed(self, summary, now=None):
+        """
+        Checks whether a model should be skipped because it is failing or breaching the latency SLO.
+
+        A shed model is re-probed once `cooldown` seconds have passed since its last sample.
+
+        Args:
+            summary (dict): The output of `stats` for the model.
+            now (float, optional): Current timestamp. Defaults to time.time().
+
+        Returns:
+            bool: True if the model should be skipped.
+        """
+        now = now if now is not None else time.time()
+        if summary["last_ts"] is not None and now - summary["last_ts"] >= self.config["cooldown"]:
+            return False
+        return self.is_unhealthy(summary)
+
+    def is_unhealthy(self, summary):
+        """Checks whether a model has enough samples and breaches the error-rate or p95 latency SLO."""
+        if summary["samples"] < self.config["min_samples"]:
+            return False
+        if summary["error_rate"] > self.config["max_error_rate"]:
+            return True
+        return summary["p95"] is not None and summary["p95"] > self.config["latency_slo"]
+
+    def weight(self, summary):
+        """Scores a model for weighted selection; untried models get the optimistic maximum of 1."""
+        if summary["samples"] == 0:
+            return 1.0
+        slo = self.config["latency_slo"]
+        speed = slo / (slo + summary["p50"]) if summary["p50"] is not None else 1.0
+        return (1 - summary["error_rate"]) * (1 - summary["dedup_rate"]) * speed
+
+    def rank(self, bulk=False):
+        """
+        Orders the configured models for the next request, best candidate first.
+
+        Models without an API key, shed models and models whose estimated cost exceeds the
+        budget are left out. In bulk mode only models meeting the dedup quality threshold are
+        kept and they are ordered cheapest first. Otherwise models are ordered by weighted
+        random sampling, with an occasional uniformly random pick to keep exploring.
+
+        Args:
+            bulk (bool): Whether to optimize for cost instead of latency and reliability.
+
+        Returns:
+            list: Ordered list of Model instances.
+        """
+        summaries = {name: self.stats(name) for name, model in self.models.items() if model.api.get("key")}
+        eligible = [
+            name
+            for name, summary in summaries.items()
+            if not self.is_shed(summary) and summary["cost"] <= self.config["cost_budget"]
+        ]
+
+        if bulk:
+            eligible = [
+                name
+                for name in eligible
+                if summaries[name]["samples"] < self.config["min_samples"]
+                or summaries[name]["dedup_rate"] <= self.config["max_dedup_rate"]
+            ]
+            eligible.sort(key=lambda name: summaries[name]["cost"])
+        elif random.random() < self.config["explore_rate"]:
+            random.shuffle(eligible)
+        else:
+            # Weighted sampling without replacement (Efraimidis-Spirakis).
+            keys = {name: random.random() ** (1 / max(self.weight(summaries[name]), 1e-6)) for name in eligible}
+            eligible.sort(key=lambda name: keys[name], reverse=True)
+
+        if not eligible:
+            logger.warning("No model meets the routing constraints; falling back to the most reliable ones.")
+            eligible = sorted(summaries, key=lambda name: summaries[name]["error_rate"])
+
+        return [self.models[name] for name in eligible]